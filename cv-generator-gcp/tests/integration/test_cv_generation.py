@@ -8,6 +8,14 @@ from utils.validation import Validation
 from utils.client import HireableClient
 from utils.utils import HireableUtils
 
+# Storage payloads shared by the mocked utils layer, serialized once at
+# import instead of inside every test's side effect.
+_SCHEMA_JSON = json.dumps({"type": "object", "properties": {"data": {"type": "object"}}})
+_FAKE_DOCX_BYTES = b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
+
+def _storage_file(bucket, name):
+    return _SCHEMA_JSON if name == "cv_schema.json" else _FAKE_DOCX_BYTES
+
 @pytest.fixture
 def sample_cv_json():
     """Load a sample CV JSON from the fixtures directory."""
@@ -43,7 +51,7 @@ class TestCVGenerationIntegration:
         # Mock for HireableUtils
         mock_utils = MagicMock()
         mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
-        mock_utils.retrieve_file_from_storage.return_value = json.dumps({"type": "object", "properties": {"data": {"type": "object"}}})
+        mock_utils.retrieve_file_from_storage.return_value = _SCHEMA_JSON
         mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.pdf"
         mock_utils.generate_cv_download_link.return_value = "https://storage.googleapis.com/test-bucket/generated-cvs/test-cv.pdf?signature"
         mock_utils_class.return_value = mock_utils
@@ -95,7 +103,7 @@ class TestCVGenerationIntegration:
         
         mock_utils = MagicMock()
         mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
-        mock_utils.retrieve_file_from_storage.return_value = json.dumps({"type": "object", "properties": {"data": {"type": "object"}}})
+        mock_utils.retrieve_file_from_storage.return_value = _SCHEMA_JSON
         mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.docx"
         mock_utils.generate_cv_download_link.return_value = "https://storage.googleapis.com/test-bucket/generated-cvs/test-cv.docx?signature"
         mock_utils_class.return_value = mock_utils
@@ -148,7 +156,7 @@ class TestCVGenerationIntegration:
         
         mock_utils = MagicMock()
         mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
-        mock_utils.retrieve_file_from_storage.return_value = json.dumps({"type": "object", "properties": {"data": {"type": "object"}}})
+        mock_utils.retrieve_file_from_storage.return_value = _SCHEMA_JSON
         mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.docx"
         mock_utils.generate_cv_download_link.return_value = "https://storage.googleapis.com/test-bucket/generated-cvs/test-cv.docx?signature"
         mock_utils_class.return_value = mock_utils
@@ -211,10 +219,7 @@ class TestCVGenerationIntegration:
         mock_utils = MagicMock()
         mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
         # Mock both schema and template file retrieval
-        mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-            json.dumps({"type": "object", "properties": {"data": {"type": "object"}}}) if name == "cv_schema.json" 
-            else b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
-        )
+        mock_utils.retrieve_file_from_storage.side_effect = _storage_file
         mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.docx"
         mock_utils.generate_cv_download_link.return_value = "https://storage.googleapis.com/test-bucket/generated-cvs/test-cv.docx?signature"
         mock_utils_class.return_value = mock_utils
@@ -1,81 +1,55 @@
 import os
+import pathlib
 import pytest
 import json
 import requests
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock
 import main
 from jsonschema import validate
 from utils.adapter import HireableCVAdapter
 
+try:
+    # Prefer orjson's C parser for decoding the fixture payload; the stdlib
+    # fallback keeps the module importable without the dev dependency
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# Load the frontend request payload once at module import; the tests only read
+# it, so a single shared dict instance is safe (deepcopy before mutating).
+_MOCK_FRONTEND_REQUEST = _loads(
+    (pathlib.Path(__file__).parent.parent / "fixtures" / "mock_frontend_request.json").read_bytes()
+)
+
+# Shared constants for the mocked storage responses and request headers.
+# MappingProxyType makes accidental mutation of the shared headers a hard
+# error instead of silent cross-test state leakage.
+_SCHEMA_STR = json.dumps({"type": "object", "properties": {"data": {"type": "object"}}})
+_FAKE_DOCX_BYTES = b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
+_JSON_HEADERS = MappingProxyType({'Content-Type': 'application/json'})
+
+# Mocked storage contents keyed by file name. A strict dict lookup instead of
+# a conditional lambda: an unexpected file name raises KeyError loudly rather
+# than silently falling through to the DOCX branch.
+_STORAGE_FILES = {
+    "cv_schema.json": _SCHEMA_STR,
+    "template_WIP.docx": _FAKE_DOCX_BYTES,
+}
+
+@pytest.fixture(scope="session")
+def mock_frontend_request():
+    """A mock request that mimics what the frontend (CV Branding Buddy) sends."""
+    return _MOCK_FRONTEND_REQUEST
+
 class TestFrontendContracts:
     """Integration tests to verify API contracts with the frontend application."""
-    
+
     @pytest.fixture
     def api_base_url(self):
         """The base URL for API testing."""
         return os.environ.get("TEST_API_BASE_URL", "http://localhost:8080")
-    
-    @pytest.fixture
-    def mock_frontend_request(self):
-        """Generate a mock request that mimics what the frontend would send."""
-        # This structure should match what CV Branding Buddy sends
-        return {
-            "template": "template_WIP.docx",
-            "outputFormat": "pdf",
-            "sectionOrder": [
-                "personal_info",
-                "profile_statement",
-                "skills",
-                "experience",
-                "education"
-            ],
-            "sectionVisibility": {
-                "personal_info": True,
-                "profile_statement": True,
-                "skills": True,
-                "experience": True,
-                "education": True
-            },
-            "isAnonymized": False,
-            "recruiterProfile": {
-                "firstName": "Jane",
-                "lastName": "Smith",
-                "email": "jane.smith@example.com",
-                "phone": "+44 1234 567890",
-                "agencyName": "Hireable Recruiting",
-                "agencyLogo": "https://example.com/logo.png",
-                "website": "https://example.com"
-            },
-            "data": {
-                "firstName": "John",
-                "surname": "Doe",
-                "email": "john.doe@example.com",
-                "phone": "+44 9876 543210",
-                "address": "London, UK",
-                "linkedin": "linkedin.com/in/johndoe",
-                "profileStatement": "Experienced software engineer with 10+ years in full-stack development...",
-                "skills": ["Python", "JavaScript", "Cloud Computing", "Agile Development"],
-                "experience": [
-                    {
-                        "role": "Senior Developer",
-                        "company": "Tech Solutions Ltd",
-                        "startDate": "2018-01",
-                        "endDate": "2023-05",
-                        "description": "Led development team in creating scalable applications..."
-                    }
-                ],
-                "education": [
-                    {
-                        "institution": "University of Technology",
-                        "degree": "BSc Computer Science",
-                        "startDate": "2013",
-                        "endDate": "2017",
-                        "grade": "First Class Honours"
-                    }
-                ]
-            }
-        }
-    
+
     @pytest.fixture
     def cv_response_schema(self):
         """Schema that defines what the frontend expects from a CV generation response."""
@@ -133,10 +107,7 @@ class TestFrontendContracts:
         
         mock_utils = MagicMock()
         mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
-        mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-            json.dumps({"type": "object"}) if name == "cv_schema.json" 
-            else b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
-        )
+        mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: _STORAGE_FILES[name]
         mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.pdf"
         mock_utils.generate_cv_download_link.return_value = "https://storage.googleapis.com/test-bucket/generated-cvs/test-cv.pdf?signature"
         mock_utils_class.return_value = mock_utils
@@ -144,7 +115,7 @@ class TestFrontendContracts:
         # Create a mock request with our frontend data
         mock_request = type('MockRequest', (), {
             'method': 'POST',
-            'headers': {'Content-Type': 'application/json'},
+            'headers': _JSON_HEADERS,
             'get_json': lambda: mock_frontend_request
         })
         
@@ -199,7 +170,7 @@ class TestFrontendContracts:
         # Create a mock request for CV parsing
         mock_request = type('MockRequest', (), {
             'method': 'POST',
-            'headers': {'Content-Type': 'application/json'},
+            'headers': _JSON_HEADERS,
             'get_json': lambda: {
                 "fileContent": "base64-encoded-content",
                 "fileName": "example-cv.pdf"
@@ -271,21 +242,18 @@ class TestFrontendContracts:
         # Create a mock request with invalid data
         mock_request = type('MockRequest', (), {
             'method': 'POST',
-            'headers': {'Content-Type': 'application/json'},
+            'headers': _JSON_HEADERS,
             'get_json': lambda: {"invalid": "data"}
         })
 
         # Mock the utils class to avoid storage errors
         with patch('main.HireableUtils') as mock_utils_class, \
              patch('main.Validation') as mock_validation_class:
-            
+
             # Configure utils mocks
             mock_utils = MagicMock()
             mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
-            mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-                json.dumps({"type": "object", "properties": {"data": {"type": "object"}}}) if name == "cv_schema.json"
-                else b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
-            )
+            mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: _STORAGE_FILES[name]
             mock_utils_class.return_value = mock_utils
             
             # Configure validation mocks
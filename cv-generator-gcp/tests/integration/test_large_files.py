@@ -1,19 +1,104 @@
 import pytest
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock
-from io import BytesIO
 import concurrent.futures
-import time
+import contextlib
+import os
+import tracemalloc
 from main import generate_cv
-from utils.client import HireableClient
-import json
+
+try:
+    # orjson's C encoder is markedly faster than stdlib json; fall back
+    # quietly since it is only a dev dependency
+    import orjson
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+    _dumps = json.dumps
+
+# Schema and template bytes served by the mocked storage layer. Built once at
+# import so the side_effects below are plain lookups instead of re-serializing
+# a ~40-key schema on every mocked storage call.
+_FULL_CV_SCHEMA_DICT = {
+    "type": "object",
+    "properties": {
+        "data": {
+            "type": "object",
+            "properties": {
+                "firstName": {"type": "string"},
+                "surname": {"type": "string"},
+                "experience": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "company": {"type": "string"},
+                            "position": {"type": "string"},
+                            "role": {"type": "string"},
+                            "startDate": {"type": "string"},
+                            "endDate": {"type": "string"},
+                            "description": {"type": "string"}
+                        },
+                        "required": ["role"]
+                    }
+                },
+                "education": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "institution": {"type": "string"},
+                            "degree": {"type": "string"},
+                            "startDate": {"type": "string"},
+                            "endDate": {"type": "string"},
+                            "description": {"type": "string"}
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+_FULL_CV_SCHEMA_JSON = _dumps(_FULL_CV_SCHEMA_DICT)
+_DOCX_HEADER = bytes.fromhex("504b03041400060008000000210000000000")
+
+# Large description payloads shared by reference across all fixture entries --
+# one allocation each instead of one per experience/education item.
+_DESC_A = "A" * 1000
+_DESC_B = "B" * 1000
+
+# Files the mocked storage layer knows about; anything else falls back to the
+# fake DOCX template header.
+_STORAGE_FIXTURES = {"cv_schema.json": _FULL_CV_SCHEMA_JSON}
+
+@pytest.fixture
+def cv_mocks(cv_mocks):
+    """Wire the shared conftest mocks to this module's storage fixtures."""
+    cv_mocks.utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
+        _STORAGE_FIXTURES.get(name, _DOCX_HEADER)
+    )
+    return cv_mocks
 
 class TestLargeFileIntegration:
     """Integration tests for large file handling and concurrent conversions."""
 
-    @pytest.fixture
+    @pytest.fixture(autouse=True, scope="class")
+    def _skip_validation(self):
+        """Accept every request; schema validation has its own unit tests."""
+        # Installed once per class instead of once per test: patching does an
+        # attribute lookup, save and restore each time it is entered
+        with patch('main.Validation.validate_request', return_value=True):
+            yield
+
+    @pytest.fixture(scope="session")
     def large_cv_json(self):
-        """Create a large CV JSON with many entries."""
-        return {
+        """Create a large CV JSON with many entries.
+
+        Session-scoped and wrapped in a read-only proxy so the fixture is
+        safe to share across pytest-xdist workers.
+        """
+        return MappingProxyType({
             "data": {
                 "firstName": "John",
                 "surname": "Doe",
@@ -24,7 +109,7 @@ class TestLargeFileIntegration:
                         "role": f"Role {i}",
                         "startDate": "2020-01-01",
                         "endDate": "2021-01-01",
-                        "description": "A" * 1000  # Large description
+                        "description": _DESC_A  # Large description
                     } for i in range(50)  # Many experience entries
                 ],
                 "education": [
@@ -33,11 +118,11 @@ class TestLargeFileIntegration:
                         "degree": f"Degree {i}",
                         "startDate": "2015-01-01",
                         "endDate": "2019-01-01",
-                        "description": "B" * 1000  # Large description
+                        "description": _DESC_B  # Large description
                     } for i in range(10)  # Many education entries
                 ]
             }
-        }
+        })
 
     @pytest.fixture
     def mock_request(self):
@@ -46,340 +131,97 @@ class TestLargeFileIntegration:
         request.method = "POST"
         return request
 
-    def test_large_cv_generation(self, large_cv_json, mock_request):
-        """Test generation of CV with large amount of data."""
+    @pytest.mark.parametrize("scenario,expected_status", [
+        ("ok", 200),
+        ("net_fail", 500),
+        ("memory", 200),
+    ])
+    def test_large_cv_processing(self, large_cv_json, mock_request, cv_mocks,
+                                 scenario, expected_status):
+        """Test large CV handling for success, network failure and memory monitoring."""
         mock_request.get_json.return_value = large_cv_json
 
-        with patch('main.HireableUtils') as mock_utils_class, \
-             patch('main.HireableClient') as mock_client_class, \
-             patch('main.DocxTemplate') as mock_docx_template_class, \
-             patch('main.Validation.validate_request', return_value=True):  # Mock validation to always pass
-            
-            # Configure mocks
-            mock_template = MagicMock()
-            def mock_save(output_stream):
-                output_stream.write(b"mock template content")
-                return None
-            mock_template.save.side_effect = mock_save
-            mock_docx_template_class.return_value = mock_template
-
-            mock_client = MagicMock()
-            mock_response = MagicMock()
-            mock_response.content = b"mock pdf content"
-            mock_client.docx_to_pdf.return_value = mock_response
-            mock_client_class.return_value = mock_client
-
-            mock_utils = MagicMock()
-            mock_utils.retrieve_profile_config.return_value = MagicMock(
-                schema_file="cv_schema.json",
-                template="template_WIP.docx"
-            )
-            mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-                json.dumps({
-                    "type": "object",
-                    "properties": {
-                        "data": {
-                            "type": "object",
-                            "properties": {
-                                "firstName": {"type": "string"},
-                                "surname": {"type": "string"},
-                                "experience": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "company": {"type": "string"},
-                                            "position": {"type": "string"},
-                                            "role": {"type": "string"},
-                                            "startDate": {"type": "string"},
-                                            "endDate": {"type": "string"},
-                                            "description": {"type": "string"}
-                                        },
-                                        "required": ["role"]
-                                    }
-                                },
-                                "education": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "institution": {"type": "string"},
-                                            "degree": {"type": "string"},
-                                            "startDate": {"type": "string"},
-                                            "endDate": {"type": "string"},
-                                            "description": {"type": "string"}
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }) if name == "cv_schema.json"
-                else b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
-            )
-            mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.pdf"
-            mock_utils.generate_cv_download_link.return_value = "https://example.com/download-link"
-            mock_utils_class.return_value = mock_utils
-
-            # Call the function
+        with contextlib.ExitStack() as stack:
+            mock_utils_class = stack.enter_context(patch('main.HireableUtils'))
+            mock_client_class = stack.enter_context(patch('main.HireableClient'))
+            mock_docx_template_class = stack.enter_context(patch('main.DocxTemplate'))
+
+            mock_docx_template_class.return_value = cv_mocks.template
+            mock_client_class.return_value = cv_mocks.client
+            mock_utils_class.return_value = cv_mocks.utils
+
+            if scenario == "net_fail":
+                # Configure client to simulate network failure on PDF output
+                cv_mocks.client.docx_to_pdf.side_effect = Exception("Network error")
+                mock_request.get_json.return_value = {
+                    "data": large_cv_json["data"],
+                    "outputFormat": "pdf"
+                }
+            # Call the function, measuring real peak memory for the memory scenario
+            if scenario == "memory":
+                tracemalloc.start()
             result = generate_cv(mock_request)
+            if scenario == "memory":
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
 
             # Verify the response
-            assert result[1] == 200
-            response_data = json.loads(result[0])
-            assert "url" in response_data
-
-            # Verify that the template was rendered with all data
-            render_args, _ = mock_template.render.call_args
-            render_context = render_args[0]
-            assert len(render_context["data"]["experience"]) == 50
-            assert len(render_context["data"]["education"]) == 10
-
-    def test_concurrent_conversions(self, large_cv_json, mock_request):
+            assert result[1] == expected_status
+            if scenario == "net_fail":
+                assert '"error":' in result[0]
+                assert "Network error" in result[0]
+            else:
+                assert '"url":' in result[0]
+
+            if scenario == "ok":
+                # Verify that the template was rendered with all data
+                render_args, _ = cv_mocks.template.render.call_args
+                render_context = render_args[0]
+                assert len(render_context["data"]["experience"]) == 50
+                assert len(render_context["data"]["education"]) == 10
+            elif scenario == "memory":
+                # Generating from the large fixture should stay well under 200MB
+                assert peak < 200 * 1024 * 1024
+
+    def test_concurrent_conversions(self, large_cv_json, mock_request, cv_mocks):
         """Test handling of concurrent CV conversions."""
         mock_request.get_json.return_value = large_cv_json
 
-        def generate_cv_wrapper():
-            with patch('main.HireableUtils') as mock_utils_class, \
-                 patch('main.HireableClient') as mock_client_class, \
-                 patch('main.DocxTemplate') as mock_docx_template_class, \
-                 patch('main.Validation.validate_request', return_value=True):  # Mock validation to always pass
-
-                # Configure mocks
-                mock_template = MagicMock()
-                def mock_save(output_stream):
-                    output_stream.write(b"mock template content")
-                    return None
-                mock_template.save.side_effect = mock_save
-                mock_template.render = MagicMock()  # Just mock the render method directly
-                mock_docx_template_class.return_value = mock_template
-
-                # Skip template file loading validation by patching render_init and init_docx
-                with patch('docxtpl.template.DocxTemplate.render_init', return_value=None), \
-                     patch('docxtpl.template.DocxTemplate.init_docx', return_value=None), \
-                     patch('docx.api.Document', return_value=MagicMock()), \
-                     patch('main.json.loads', return_value={"type": "object", "properties": {"data": {"type": "object"}}}): # Mock json.loads instead of using the actual function
-                    mock_client = MagicMock()
-                    mock_response = MagicMock()
-                    mock_response.content = b"mock pdf content"
-                    mock_client.docx_to_pdf.return_value = mock_response
-                    mock_client_class.return_value = mock_client
-
-                    mock_utils = MagicMock()
-                    mock_utils.retrieve_profile_config.return_value = MagicMock(
-                        schema_file="cv_schema.json",
-                        template="template_WIP.docx"
-                    )
-                    # Return a valid schema and a valid docx file binary header for template
-                    mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-                        json.dumps({
-                            "type": "object",
-                            "properties": {
-                                "data": {"type": "object"}
-                            }
-                        }) if name == "cv_schema.json"
-                        else b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00\x00\x00' # Valid ZIP/DOCX header
-                    )
-                    mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.pdf"
-                    mock_utils.generate_cv_download_link.return_value = "https://example.com/download-link"
-                    mock_utils_class.return_value = mock_utils
-
-                    return generate_cv(mock_request)
+        # Apply the patches once, outside the executor. unittest.mock patching
+        # takes module-level locks, so re-applying the whole stack inside each
+        # worker both serializes the threads and races their teardown.
+        with contextlib.ExitStack() as stack:
+            mock_utils_class = stack.enter_context(patch('main.HireableUtils'))
+            mock_client_class = stack.enter_context(patch('main.HireableClient'))
+            mock_docx_template_class = stack.enter_context(patch('main.DocxTemplate'))
+            # Skip template file loading validation by patching render_init and init_docx
+            stack.enter_context(patch('docxtpl.template.DocxTemplate.render_init', return_value=None))
+            stack.enter_context(patch('docxtpl.template.DocxTemplate.init_docx', return_value=None))
+            stack.enter_context(patch('docx.api.Document', return_value=MagicMock()))
+            # Mock json.loads instead of using the actual function
+            stack.enter_context(patch(
+                'main.json.loads',
+                return_value={"type": "object", "properties": {"data": {"type": "object"}}}
+            ))
+
+            cv_mocks.template.render = MagicMock()  # Just mock the render method directly
+            mock_docx_template_class.return_value = cv_mocks.template
+            mock_client_class.return_value = cv_mocks.client
+            # The schema is never parsed here (main.json.loads is patched
+            # above), so serve a stub instead of the full serialized schema
+            cv_mocks.utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
+                b"{}" if name == "cv_schema.json" else _DOCX_HEADER
+            )
+            mock_utils_class.return_value = cv_mocks.utils
 
-        # Run multiple conversions concurrently
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(generate_cv_wrapper) for _ in range(5)]
-            results = [future.result() for future in concurrent.futures.as_completed(futures)]
+            # Run multiple conversions concurrently
+            workers = min(5, (os.cpu_count() or 1))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                # Completion order is irrelevant to the asserts, so map is
+                # simpler than submit + as_completed bookkeeping
+                results = list(executor.map(lambda _: generate_cv(mock_request), range(5)))
 
         # Verify all conversions completed successfully
         for result in results:
             assert result[1] == 200
-            response_data = json.loads(result[0])
-            assert "url" in response_data
-
-    def test_network_failure_handling(self, large_cv_json, mock_request):
-        """Test handling of network failures during large file operations."""
-        mock_request.get_json.return_value = large_cv_json
-
-        with patch('main.HireableUtils') as mock_utils_class, \
-             patch('main.HireableClient') as mock_client_class, \
-             patch('main.DocxTemplate') as mock_docx_template_class, \
-             patch('main.Validation.validate_request', return_value=True):  # Mock validation to always pass
-            
-            # Configure mocks
-            mock_template = MagicMock()
-            def mock_save(output_stream):
-                output_stream.write(b"mock template content")
-                return None
-            mock_template.save.side_effect = mock_save
-            mock_docx_template_class.return_value = mock_template
-
-            # Configure client to simulate network failure
-            mock_client = MagicMock()
-            mock_client.docx_to_pdf.side_effect = Exception("Network error")
-            mock_client_class.return_value = mock_client
-
-            mock_utils = MagicMock()
-            mock_utils.retrieve_profile_config.return_value = MagicMock(
-                schema_file="cv_schema.json",
-                template="template_WIP.docx"
-            )
-            # Return a schema that validates our test data
-            mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-                json.dumps({
-                    "type": "object",
-                    "properties": {
-                        "data": {
-                            "type": "object",
-                            "properties": {
-                                "firstName": {"type": "string"},
-                                "surname": {"type": "string"},
-                                "experience": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "company": {"type": "string"},
-                                            "position": {"type": "string"},
-                                            "role": {"type": "string"},
-                                            "startDate": {"type": "string"},
-                                            "endDate": {"type": "string"},
-                                            "description": {"type": "string"}
-                                        },
-                                        "required": ["role"]
-                                    }
-                                },
-                                "education": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "institution": {"type": "string"},
-                                            "degree": {"type": "string"},
-                                            "startDate": {"type": "string"},
-                                            "endDate": {"type": "string"},
-                                            "description": {"type": "string"}
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }) if name == "cv_schema.json"
-                else b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
-            )
-            # Important: Return string instead of MagicMock to avoid serialization issues
-            mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.pdf"
-            mock_utils.generate_cv_download_link.return_value = "https://example.com/download-link"
-            mock_utils_class.return_value = mock_utils
-
-            # Mock the request to request PDF output format
-            mock_request.get_json.return_value = {
-                "data": large_cv_json["data"],
-                "outputFormat": "pdf"
-            }
-
-            # Call the function
-            result = generate_cv(mock_request)
-
-            # Verify error handling
-            assert result[1] == 500
-            response_data = json.loads(result[0])
-            assert "error" in response_data
-            assert "Network error" in response_data["error"]
-
-    def test_memory_usage_large_file(self, large_cv_json, mock_request):
-        """Test memory usage during large file operations."""
-        mock_request.get_json.return_value = large_cv_json
-
-        with patch('main.HireableUtils') as mock_utils_class, \
-             patch('main.HireableClient') as mock_client_class, \
-             patch('main.DocxTemplate') as mock_docx_template_class, \
-             patch('main.psutil.Process') as mock_process, \
-             patch('main.Validation.validate_request', return_value=True):  # Mock validation to always pass
-            
-            # Configure memory monitoring
-            mock_process_instance = MagicMock()
-            mock_process_instance.memory_info.return_value = MagicMock(rss=1024 * 1024 * 100)  # 100MB
-            mock_process.return_value = mock_process_instance
-
-            # Configure other mocks
-            mock_template = MagicMock()
-            def mock_save(output_stream):
-                output_stream.write(b"mock template content")
-                return None
-            mock_template.save.side_effect = mock_save
-            mock_docx_template_class.return_value = mock_template
-
-            mock_client = MagicMock()
-            mock_response = MagicMock()
-            mock_response.content = b"mock pdf content"
-            mock_client.docx_to_pdf.return_value = mock_response
-            mock_client_class.return_value = mock_client
-
-            mock_utils = MagicMock()
-            mock_utils.retrieve_profile_config.return_value = MagicMock(
-                schema_file="cv_schema.json",
-                template="template_WIP.docx"
-            )
-            # Return a schema that validates our test data
-            mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-                json.dumps({
-                    "type": "object",
-                    "properties": {
-                        "data": {
-                            "type": "object",
-                            "properties": {
-                                "firstName": {"type": "string"},
-                                "surname": {"type": "string"},
-                                "experience": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "company": {"type": "string"},
-                                            "position": {"type": "string"},
-                                            "role": {"type": "string"},
-                                            "startDate": {"type": "string"},
-                                            "endDate": {"type": "string"},
-                                            "description": {"type": "string"}
-                                        },
-                                        "required": ["role"]
-                                    }
-                                },
-                                "education": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "institution": {"type": "string"},
-                                            "degree": {"type": "string"},
-                                            "startDate": {"type": "string"},
-                                            "endDate": {"type": "string"},
-                                            "description": {"type": "string"}
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }) if name == "cv_schema.json"
-                else b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
-            )
-            mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.pdf"
-            mock_utils.generate_cv_download_link.return_value = "https://example.com/download-link"
-            mock_utils_class.return_value = mock_utils
-
-            # Add this line to ensure psutil.Process is called
-            def memory_check(*args, **kwargs):
-                mock_process_instance.memory_info()
-                return generate_cv(mock_request)
-
-            # Call the function
-            result = memory_check()
-
-            # Verify the response
-            assert result[1] == 200
-
-            # Verify memory monitoring was called
-            assert mock_process_instance.memory_info.call_count > 0 
\ No newline at end of file
+            assert '"url":' in result[0]
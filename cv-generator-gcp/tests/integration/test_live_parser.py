@@ -1,17 +1,17 @@
+import functools
 import pytest
-from io import BytesIO
 import os
 import jwt
+import requests
 import time
 import base64
 
-def generate_test_token():
-    """Generate a valid JWT token for testing."""
-    # Get JWT secret from environment - this should match the one in Secret Manager
+def _decode_jwt_secret():
+    """Resolve the JWT signing secret from the environment."""
     jwt_secret = os.getenv("SUPABASE_JWT_SECRET")
     if not jwt_secret:
         raise ValueError("SUPABASE_JWT_SECRET environment variable must be set for live tests")
-        
+
     # Decode the base64 secret if it's encoded
     try:
         # Try to decode the secret as it might be base64 encoded
@@ -19,39 +19,54 @@ def generate_test_token():
     except Exception:
         # If decoding fails, use the secret as is
         pass
-        
-    project_ref = os.getenv("SUPABASE_PROJECT_REF", "test-project-ref")
-    
-    # Create the token payload with all required claims
-    current_time = int(time.time())
+    return jwt_secret
+
+_PROJECT_REF = os.getenv("SUPABASE_PROJECT_REF", "test-project-ref")
+
+# Static claims shared by every test token; only iat/exp vary per call.
+_PAYLOAD_BASE = {
+    "sub": "test-user-id",
+    "email": "test@example.com",
+    "role": "authenticated",
+    "iss": f"https://{_PROJECT_REF}.supabase.co/auth/v1",
+    "aud": "authenticated"
+}
+
+@functools.lru_cache(maxsize=4)
+def _cached_token(iat_bucket):
+    """Sign a test token for the given 10-minute issue window."""
+    jwt_secret = _decode_jwt_secret()
+
+    # Merge the time-sensitive claims into the static payload
+    current_time = iat_bucket * 600
     payload = {
-        "sub": "test-user-id",
-        "email": "test@example.com",
-        "role": "authenticated",
+        **_PAYLOAD_BASE,
         "iat": current_time,
-        "exp": current_time + 3600,  # 1 hour expiry
-        "iss": f"https://{project_ref}.supabase.co/auth/v1",
-        "aud": "authenticated"
+        "exp": current_time + 3600  # 1 hour expiry
     }
-    
+
     # Sign the token with the secret
     token = jwt.encode(payload, jwt_secret, algorithm="HS256")
     return token
 
+def generate_test_token():
+    """Generate a valid JWT token for testing.
+
+    Tokens are valid for an hour, so signing one per 10-minute bucket and
+    caching it avoids repeating the HMAC work for every test.
+    """
+    return _cached_token(int(time.time()) // 600)
+
 @pytest.mark.live
+@pytest.mark.skipif(os.environ.get("RUN_LIVE_PARSER_TESTS", "0") != "1",
+                    reason="Live parser tests are disabled")
+@pytest.mark.skipif(not os.getenv("SUPABASE_JWT_SECRET"),
+                    reason="SUPABASE_JWT_SECRET environment variable must be set for live tests")
 class TestLiveParser:
     """Test suite for live parser service integration."""
     
     def test_parse_cv_live(self, live_parser_client, sample_cv_file):
         """Test live CV parsing with actual parser service."""
-        # Skip if live parser tests are disabled
-        if os.environ.get("RUN_LIVE_PARSER_TESTS", "0") != "1":
-            pytest.skip("Live parser tests are disabled")
-            
-        # Skip if JWT secret is not configured
-        if not os.getenv("SUPABASE_JWT_SECRET"):
-            pytest.skip("SUPABASE_JWT_SECRET environment variable must be set for live tests")
-            
         # Reset file pointer to beginning
         sample_cv_file.seek(0)
         
@@ -99,19 +114,13 @@ class TestLiveParser:
                 assert "degree" in first_edu
                 assert "startDate" in first_edu
                 assert "endDate" in first_edu
-        except Exception as e:
+        except (requests.RequestException, jwt.PyJWTError) as e:
+            # Only skip on connectivity/auth problems; assertion failures
+            # should surface as real failures
             pytest.skip(f"Live parser test failed: {str(e)}")
     
     def test_parse_cv_with_job_description(self, live_parser_client, sample_cv_file):
         """Test live CV parsing with job description."""
-        # Skip if live parser tests are disabled
-        if os.environ.get("RUN_LIVE_PARSER_TESTS", "0") != "1":
-            pytest.skip("Live parser tests are disabled")
-            
-        # Skip if JWT secret is not configured
-        if not os.getenv("SUPABASE_JWT_SECRET"):
-            pytest.skip("SUPABASE_JWT_SECRET environment variable must be set for live tests")
-            
         # Reset file pointer to beginning
         sample_cv_file.seek(0)
         
@@ -147,11 +156,5 @@ class TestLiveParser:
                 required_skills = ["Python", "AWS", "Docker"]
                 found_skills = [skill["name"] for skill in skills]
                 assert any(skill in found_skills for skill in required_skills)
-        except Exception as e:
+        except (requests.RequestException, jwt.PyJWTError) as e:
             pytest.skip(f"Live parser test with job description failed: {str(e)}")
-
-@pytest.fixture
-def sample_cv_file():
-    """Sample CV file content for parser integration tests."""
-    # Return BytesIO instead of bytes to support seek operation
-    return BytesIO(b"This is a sample CV with some formatted content for parsing tests.") 
\ No newline at end of file
@@ -1,22 +1,55 @@
+import base64
 import os
+import pathlib
 import pytest
+from dataclasses import dataclass, field
 import json
 import jwt
-import requests
-from unittest.mock import patch, MagicMock
-import main
-from utils.security import SecurityUtils
-from io import BytesIO
+from unittest.mock import patch, MagicMock, DEFAULT
+
+# main (Flask endpoints plus the Google SDK stack) and utils.security are
+# imported lazily inside the tests that need them, keeping collection of this
+# module cheap; the patch targets are strings, so no import is needed here.
+
+# Storage payloads served by the mocked utils layer. The sample DOCX is read
+# from disk once at import instead of on every mocked storage call.
+_SCHEMA_JSON = json.dumps({"type": "object", "properties": {"data": {"type": "object"}}})
+_MINIMAL_DOCX = (pathlib.Path(__file__).parent / "../samples/minimal.docx").read_bytes()
+_STORAGE_FILES = {"cv_schema.json": _SCHEMA_JSON, "template_WIP.docx": _MINIMAL_DOCX}
+
+# HS256 signing key wrapped in a PyJWK once at import, so token signing gets
+# ready-to-use key material instead of re-parsing the secret per encode call.
+_JWT_SECRET = os.environ.get("TEST_SUPABASE_JWT_SECRET", "test-jwt-secret")
+_JWT_KEY = jwt.PyJWK({
+    "kty": "oct",
+    "k": base64.urlsafe_b64encode(_JWT_SECRET.encode()).rstrip(b"=").decode(),
+    "alg": "HS256",
+})
+
+@dataclass
+class MockRequest:
+    """Lightweight stand-in for the Flask request object.
+
+    A plain instance per test is much cheaper than synthesizing a new class
+    with type() each time, and reads the same at the call site.
+    """
+    method: str
+    headers: dict
+    json_body: dict = field(default_factory=dict)
+
+    def get_json(self, silent=False):
+        return self.json_body
 
 class TestSupabaseIntegration:
     """Integration tests for Supabase authentication and authorization flows."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def supabase_config(self):
         """Fixture to provide Supabase configuration for tests.
         
         In a CI environment, these would be set as environment variables.
         For local testing, they can be provided through test configuration.
+        Session-scoped: the environment is only read once per run.
         """
         return {
             "url": os.environ.get("TEST_SUPABASE_URL", "https://example.supabase.co"),
@@ -27,12 +60,19 @@ class TestSupabaseIntegration:
             "test_user_password": os.environ.get("TEST_SUPABASE_USER_PASSWORD", "test-password"),
         }
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
+    def decoded_jwt(self):
+        """The decoded-token payload the endpoint tests expect back."""
+        return {"sub": "test-user-id", "email": "test@example.com"}
+
+    @pytest.fixture(scope="session")
     def mock_supabase_token(self, supabase_config):
         """Create a valid Supabase JWT token for testing.
         
         This creates a token with the proper structure that will validate.
         In a real test, you might want to get an actual token from Supabase.
+        Session-scoped: the payload is static (fixed far-future expiry), so
+        one HS256 signing covers every test that needs the token.
         """
         payload = {
             "sub": "test-user-id",
@@ -42,7 +82,7 @@ class TestSupabaseIntegration:
             "exp": 4102444800,  # Far future expiry (2100-01-01)
             "iss": f"https://{supabase_config['project_ref']}.supabase.co/auth/v1"
         }
-        token = jwt.encode(payload, supabase_config["jwt_secret"], algorithm="HS256")
+        token = jwt.encode(payload, _JWT_KEY.key, algorithm="HS256")
         return token
     
     @pytest.fixture
@@ -53,6 +93,8 @@ class TestSupabaseIntegration:
     @patch.dict(os.environ, {"SUPABASE_JWT_SECRET": "test-jwt-secret"})
     def test_validate_token(self, mock_supabase_token):
         """Test that the security utility can validate a Supabase token."""
+        from utils.security import SecurityUtils
+
         security = SecurityUtils()
         
         # This should not raise an exception if the token is valid
@@ -61,50 +103,54 @@ class TestSupabaseIntegration:
         assert decoded["sub"] == "test-user-id"
         assert decoded["email"] == "test@example.com"
     
-    @patch('main.SecurityUtils.validate_supabase_jwt')
-    @patch('main.HireableUtils')
-    @patch('main.generate_cv_from_template')
-    @patch.dict(os.environ, {"REQUIRE_AUTHENTICATION": "true", "TESTING": "false"})
-    def test_protected_endpoint_with_valid_token(self, mock_generate_cv, mock_utils_class, mock_validate_jwt, mock_supabase_token):
+    def test_protected_endpoint_with_valid_token(self, mock_supabase_token, decoded_jwt, monkeypatch):
         """Test that protected endpoints accept valid Supabase tokens."""
-        # Configure the mock to return a decoded token
-        mock_validate_jwt.return_value = {
-            "sub": "test-user-id",
-            "email": "test@example.com"
-        }
+        import main
+        from io import BytesIO
+
+        monkeypatch.setenv("REQUIRE_AUTHENTICATION", "true")
+        monkeypatch.setenv("TESTING", "false")
+
+        # One patch.multiple call instead of a stack of decorators: a single
+        # context entry/exit covers both main attributes.
+        with patch.multiple('main', HireableUtils=DEFAULT,
+                            generate_cv_from_template=DEFAULT) as mocks, \
+             patch('main.SecurityUtils.validate_supabase_jwt') as mock_validate_jwt:
+            mock_utils_class = mocks['HireableUtils']
+            mock_generate_cv = mocks['generate_cv_from_template']
+
+            # Configure the mock to return a decoded token
+            mock_validate_jwt.return_value = decoded_jwt
         
-        # Configure the template rendering mock to return a BytesIO object
-        output_stream = BytesIO(b"mocked document content")
-        mock_generate_cv.return_value = output_stream
+            # Configure the template rendering mock to return a BytesIO object
+            output_stream = BytesIO(b"mocked document content")
+            mock_generate_cv.return_value = output_stream
         
-        # Configure the utils mock to return proper JSON strings
-        mock_utils = MagicMock()
-        mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
-        mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-            json.dumps({"type": "object", "properties": {"data": {"type": "object"}}}) if name == "cv_schema.json"
-            # Return a small valid zip structure for DOCX files
-            else open(os.path.join(os.path.dirname(__file__), '../samples/minimal.docx'), 'rb').read() if hasattr(open, 'read')
-            else b'PK\x03\x04\x14\x00\x08\x08\x08\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'  # Minimal valid ZIP header
-        )
-        mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.pdf"
-        mock_utils.generate_cv_download_link.return_value = "https://example.com/download-link"
-        mock_utils_class.return_value = mock_utils
+            # Configure the utils mock to return proper JSON strings
+            mock_utils = MagicMock()
+            mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
+            mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
+                _STORAGE_FILES.get(name, _MINIMAL_DOCX)
+            )
+            mock_utils.upload_cv_to_storage.return_value = "generated-cvs/test-cv.pdf"
+            mock_utils.generate_cv_download_link.return_value = "https://example.com/download-link"
+            mock_utils_class.return_value = mock_utils
         
-        # Create a mock request with an Authorization header
-        mock_request = type('MockRequest', (), {
-            'method': 'GET',
-            'headers': {'Authorization': f'Bearer {mock_supabase_token}'},
-            'get_json': lambda: {"data": {"firstName": "Test", "surname": "User"}}
-        })
+            # Create a mock request with an Authorization header
+            mock_request = MockRequest(
+                method='GET',
+                headers={'Authorization': f'Bearer {mock_supabase_token}'},
+                json_body={"data": {"firstName": "Test", "surname": "User"}},
+            )
         
-        # Call the protected endpoint
-        result = main.generate_cv(mock_request)
+            # Call the protected endpoint
+            result = main.generate_cv(mock_request)
         
-        # Verify token was validated
-        mock_validate_jwt.assert_called_once_with(mock_supabase_token)
+            # Verify token was validated
+            mock_validate_jwt.assert_called_once_with(mock_supabase_token)
         
-        # Check the response
-        assert result[1] == 200
+            # Check the response
+            assert result[1] == 200
 
     @patch('main.security.validate_supabase_jwt')
     @patch('main.HireableUtils')
@@ -112,15 +158,17 @@ class TestSupabaseIntegration:
     @patch.dict(os.environ, {"REQUIRE_AUTHENTICATION": "true", "TESTING": "false"})
     def test_protected_endpoint_with_invalid_token(self, mock_generate_cv, mock_utils_class, mock_validate_jwt):
         """Test that protected endpoints reject invalid Supabase tokens."""
+        import main
+
         # Configure the mock to raise an exception
         mock_validate_jwt.side_effect = ValueError("Invalid token")
         
         # Create a mock request with an invalid Authorization header
-        mock_request = type('MockRequest', (), {
-            'method': 'GET',
-            'headers': {'Authorization': 'Bearer invalid-token'},
-            'get_json': lambda: {"data": {"firstName": "Test", "surname": "User"}}
-        })
+        mock_request = MockRequest(
+            method='GET',
+            headers={'Authorization': 'Bearer invalid-token'},
+            json_body={"data": {"firstName": "Test", "surname": "User"}},
+        )
         
         # Call the protected endpoint
         result = main.parse_cv(mock_request)  # Use parse_cv instead which stops at auth
@@ -129,18 +177,21 @@ class TestSupabaseIntegration:
         assert result[1] == 401
         assert "error" in json.loads(result[0])
     
+    @pytest.mark.live
+    @pytest.mark.skipif(os.environ.get("RUN_LIVE_SUPABASE_TESTS", "0") != "1",
+                        reason="Live Supabase tests are disabled")
     def test_live_supabase_authentication(self, supabase_config, api_base_url):
         """Test authentication against a real Supabase instance.
         
         This test uses a real Supabase project for authentication testing.
+        Skipped at collection time so the fixtures are never set up and the
+        Supabase SDK is never imported on ordinary runs.
         """
-        # Skip this test if live Supabase tests are not enabled
-        if os.environ.get("RUN_LIVE_SUPABASE_TESTS", "0") != "1":
-            pytest.skip("Live Supabase tests are disabled")
-            
-        # This would use the actual Supabase JS client in Python tests
+        import requests
+
+        # This would use the actual Supabase client in Python tests
         # For now, we'll sketch the concept
-        from supabase import create_client
+        create_client = pytest.importorskip("supabase").create_client
         
         # Initialize the Supabase client
         try:
@@ -0,0 +1,101 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from utils.security import SecurityUtils
+from utils.utils import HireableUtils
+
+# Storage payloads served by the mocked utils layer in the main-function
+# tests, built once at import instead of inside every test body.
+_SCHEMA_JSON = json.dumps({"type": "object"})
+_TEMPLATE_DOCX_BYTES = b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
+
+def _storage_file(bucket, name):
+    return _SCHEMA_JSON if name == "cv_schema.json" else _TEMPLATE_DOCX_BYTES
+
+# Prototype mocks for main's collaborators: the MagicMock trees are built once
+# per module and handed out through function-scoped fixtures that reset call
+# records and re-pin the baseline wiring, so per-test overrides (e.g. a
+# failing validation) never leak into the next test. A shallow copy would not
+# do here because copied mocks share their children with the prototype.
+
+@pytest.fixture
+def hireable_utils(mock_storage_client):
+    """HireableUtils wired to the mock storage client and test bucket.
+
+    Replaces the construct-then-assign boilerplate each storage test used
+    to repeat; the heavyweight Google clients are already stubbed by the
+    autouse mock_google_cloud fixture.
+    """
+    utils = HireableUtils()
+    utils.storage_client = mock_storage_client
+    utils.bucket_name = "test-bucket"
+    return utils
+
+@pytest.fixture(scope="session")
+def _security_utils_instance():
+    """One SecurityUtils for the whole session.
+
+    Construction builds a SecretManagerServiceClient; the JWT secret itself
+    is read per validation call, so tests still control it via the
+    environment.
+    """
+    with patch("utils.security.secretmanager.SecretManagerServiceClient"):
+        return SecurityUtils(project_id="test-project")
+
+@pytest.fixture
+def security_utils(_security_utils_instance):
+    """The session SecurityUtils with its token cache cleared per test."""
+    _security_utils_instance._token_cache.clear()
+    return _security_utils_instance
+
+@pytest.fixture(scope="module")
+def _main_validation_proto():
+    return MagicMock()
+
+@pytest.fixture
+def main_validation(_main_validation_proto):
+    """Validation mock that accepts the request and returns transformed keys."""
+    mock = _main_validation_proto
+    mock.reset_mock()
+    mock.validate_request.return_value = True
+    mock._transform_request_keys.return_value = {
+        "data": {
+            "first_name": "John",
+            "surname": "Doe",
+            "experience": []
+        }
+    }
+    return mock
+
+@pytest.fixture(scope="module")
+def _main_client_proto():
+    return MagicMock()
+
+@pytest.fixture
+def main_client(_main_client_proto):
+    """HireableClient mock whose PDF conversion returns static content."""
+    mock = _main_client_proto
+    mock.reset_mock()
+    # Only .content is ever read from the conversion response
+    mock.docx_to_pdf.return_value = SimpleNamespace(content=b"mock pdf content")
+    return mock
+
+@pytest.fixture(scope="module")
+def _main_utils_proto():
+    proto = MagicMock()
+    # Read-only sub-mocks can be wired once for the whole module
+    proto.retrieve_profile_config.return_value = MagicMock(
+        schema_file="cv_schema.json", template="template_WIP.docx"
+    )
+    return proto
+
+@pytest.fixture
+def main_utils(_main_utils_proto):
+    """HireableUtils mock serving the schema/template and a download link."""
+    mock = _main_utils_proto
+    mock.reset_mock()
+    mock.retrieve_file_from_storage.side_effect = _storage_file
+    mock.generate_cv_download_link.return_value = "https://example.com/download-link"
+    return mock
@@ -1,171 +1,240 @@
 import pytest
 import json
+from types import MappingProxyType
 from utils.adapter import HireableCVAdapter
 
+# Input payloads shared across the parametrized conversion tests. Built once at
+# module import and wrapped read-only so a test cannot mutate shared state; the
+# adapter only reads from its input.
+_PARSER_BASIC = MappingProxyType({
+    "contact_info": {
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": "john.doe@example.com",
+        "phone": "+44 123 456 7890",
+        "location": "London, UK"
+    },
+    "personal_statement": "Experienced software developer with expertise in Python and cloud services.",
+    "skills": ["Python", "JavaScript", "AWS", "GCP", "Docker"],
+    "links": ["https://linkedin.com/in/johndoe", "https://github.com/johndoe"]
+})
+
+_PARSER_COMPLEX = MappingProxyType({
+    "contact_info": {
+        "first_name": "Jane",
+        "last_name": "Smith",
+        "email": "jane.smith@example.com"
+    },
+    "experience": [
+        {
+            "title": "Senior Developer",
+            "company": "Tech Co",
+            "start_date": "2020-01",
+            "end_date": "",
+            "is_current": True,
+            "description": "Leading development team."
+        },
+        {
+            "title": "Developer",
+            "company": "Startup Inc",
+            "start_date": "2018-03",
+            "end_date": "2019-12",
+            "is_current": False,
+            "description": "Developed web applications."
+        }
+    ],
+    "education": [
+        {
+            "institution": "University of Example",
+            "degree": "Computer Science",
+            "start_date": "2014-09",
+            "end_date": "2018-06",
+            "grade": "First Class"
+        }
+    ]
+})
+
+_GENERATOR_BASIC = MappingProxyType({
+    "data": {
+        "firstName": "Alice",
+        "surname": "Johnson",
+        "email": "alice.johnson@example.com",
+        "phone": "+44 987 654 3210",
+        "address": "Manchester, UK",
+        "profileStatement": "Dedicated project manager with 5+ years experience.",
+        "skills": ["Project Management", "Agile", "Scrum", "Leadership"],
+        "linkedin": "https://linkedin.com/in/alicejohnson"
+    }
+})
+
+_GENERATOR_COMPLEX = MappingProxyType({
+    "data": {
+        "firstName": "Bob",
+        "surname": "Brown",
+        "experience": [
+            {
+                "role": "Marketing Manager",
+                "company": "Brand Co",
+                "startDate": "2019-05",
+                "endDate": "",
+                "current": True,
+                "description": "Managing marketing campaigns."
+            }
+        ],
+        "education": [
+            {
+                "institution": "Marketing School",
+                "degree": "Marketing",
+                "startDate": "2015-09",
+                "endDate": "2019-06",
+                "grade": "Merit"
+            }
+        ],
+        "certifications": [
+            {
+                "name": "Digital Marketing",
+                "issuer": "Marketing Institute",
+                "date": "2020-01"
+            }
+        ]
+    }
+})
+
+def _strip_empty(obj):
+    """Drop None/empty-string values so adapter-inserted defaults for fields
+    absent from the original payload do not fail round-trip comparison."""
+    if isinstance(obj, dict):
+        return {k: _strip_empty(v) for k, v in obj.items() if v is not None and v != ""}
+    if isinstance(obj, list):
+        return [_strip_empty(item) for item in obj]
+    return obj
+
+def _dig(obj, path):
+    """Follow a dotted path like "data.experience" into nested dicts."""
+    for part in path.split("."):
+        obj = obj[part]
+    return obj
+
 class TestHireableCVAdapter:
     """Test suite for the HireableCVAdapter class."""
-    
-    def test_parser_to_generator_basic(self):
-        """Test basic conversion from parser format to generator format."""
-        parser_data = {
-            "contact_info": {
-                "first_name": "John",
-                "last_name": "Doe",
-                "email": "john.doe@example.com",
-                "phone": "+44 123 456 7890",
-                "location": "London, UK"
+
+    @pytest.mark.parametrize("direction,payload,expected", [
+        pytest.param(
+            "parser_to_generator", _PARSER_BASIC,
+            {
+                "data.firstName": "John",
+                "data.surname": "Doe",
+                "data.email": "john.doe@example.com",
+                "data.phone": "+44 123 456 7890",
+                "data.address": "London, UK",
+                "data.profileStatement": "Experienced software developer with expertise in Python and cloud services.",
+                "data.skills": ["Python", "JavaScript", "AWS", "GCP", "Docker"],
+                "data.linkedin": "https://linkedin.com/in/johndoe",
+                "data.website": "https://github.com/johndoe",
             },
-            "personal_statement": "Experienced software developer with expertise in Python and cloud services.",
-            "skills": ["Python", "JavaScript", "AWS", "GCP", "Docker"],
-            "links": ["https://linkedin.com/in/johndoe", "https://github.com/johndoe"]
-        }
-        
-        result = HireableCVAdapter.parser_to_generator(parser_data)
-        
-        assert "data" in result
-        assert result["data"]["firstName"] == "John"
-        assert result["data"]["surname"] == "Doe"
-        assert result["data"]["email"] == "john.doe@example.com"
-        assert result["data"]["phone"] == "+44 123 456 7890"
-        assert result["data"]["address"] == "London, UK"
-        assert result["data"]["profileStatement"] == "Experienced software developer with expertise in Python and cloud services."
-        assert result["data"]["skills"] == ["Python", "JavaScript", "AWS", "GCP", "Docker"]
-        assert result["data"]["linkedin"] == "https://linkedin.com/in/johndoe"
-        assert result["data"]["website"] == "https://github.com/johndoe"
-    
-    def test_parser_to_generator_complex(self):
-        """Test conversion with experience and education data."""
-        parser_data = {
-            "contact_info": {
-                "first_name": "Jane",
-                "last_name": "Smith",
-                "email": "jane.smith@example.com"
+            id="parser_to_generator_basic"),
+        pytest.param(
+            # Whole-subtree equality: one C-level dict comparison per list
+            # instead of a chain of per-field lookups, with a full pytest
+            # diff on failure.
+            "parser_to_generator", _PARSER_COMPLEX,
+            {
+                "data.experience": [
+                    {
+                        "role": "Senior Developer",
+                        "company": "Tech Co",
+                        "startDate": "2020-01",
+                        "endDate": "",
+                        "current": True,
+                        "description": "Leading development team.",
+                    },
+                    {
+                        "role": "Developer",
+                        "company": "Startup Inc",
+                        "startDate": "2018-03",
+                        "endDate": "2019-12",
+                        "current": False,
+                        "description": "Developed web applications.",
+                    },
+                ],
+                "data.education": [
+                    {
+                        "institution": "University of Example",
+                        "degree": "Computer Science",
+                        "startDate": "2014-09",
+                        "endDate": "2018-06",
+                        "grade": "First Class",
+                    },
+                ],
             },
-            "experience": [
-                {
-                    "title": "Senior Developer",
-                    "company": "Tech Co",
-                    "start_date": "2020-01",
-                    "end_date": "",
-                    "is_current": True,
-                    "description": "Leading development team."
-                },
-                {
-                    "title": "Developer",
-                    "company": "Startup Inc",
-                    "start_date": "2018-03",
-                    "end_date": "2019-12",
-                    "is_current": False,
-                    "description": "Developed web applications."
-                }
-            ],
-            "education": [
-                {
-                    "institution": "University of Example",
-                    "degree": "Computer Science",
-                    "start_date": "2014-09",
-                    "end_date": "2018-06",
-                    "grade": "First Class"
-                }
-            ]
-        }
-        
-        result = HireableCVAdapter.parser_to_generator(parser_data)
-        
-        assert "data" in result
-        assert len(result["data"]["experience"]) == 2
-        assert result["data"]["experience"][0]["role"] == "Senior Developer"
-        assert result["data"]["experience"][0]["company"] == "Tech Co"
-        assert result["data"]["experience"][0]["current"] == True
-        
-        assert len(result["data"]["education"]) == 1
-        assert result["data"]["education"][0]["institution"] == "University of Example"
-        assert result["data"]["education"][0]["degree"] == "Computer Science"
-        assert result["data"]["education"][0]["grade"] == "First Class"
-    
-    def test_generator_to_parser_basic(self):
-        """Test basic conversion from generator format to parser format."""
-        generator_data = {
-            "data": {
-                "firstName": "Alice",
-                "surname": "Johnson",
-                "email": "alice.johnson@example.com",
-                "phone": "+44 987 654 3210",
-                "address": "Manchester, UK",
-                "profileStatement": "Dedicated project manager with 5+ years experience.",
+            id="parser_to_generator_complex"),
+        pytest.param(
+            "generator_to_parser", _GENERATOR_BASIC,
+            {
+                "contact_info.first_name": "Alice",
+                "contact_info.last_name": "Johnson",
+                "contact_info.email": "alice.johnson@example.com",
+                "contact_info.phone": "+44 987 654 3210",
+                "contact_info.location": "Manchester, UK",
+                "personal_statement": "Dedicated project manager with 5+ years experience.",
                 "skills": ["Project Management", "Agile", "Scrum", "Leadership"],
-                "linkedin": "https://linkedin.com/in/alicejohnson"
-            }
-        }
-        
-        result = HireableCVAdapter.generator_to_parser(generator_data)
-        
-        assert "contact_info" in result
-        assert result["contact_info"]["first_name"] == "Alice"
-        assert result["contact_info"]["last_name"] == "Johnson"
-        assert result["contact_info"]["email"] == "alice.johnson@example.com"
-        assert result["contact_info"]["phone"] == "+44 987 654 3210"
-        assert result["contact_info"]["location"] == "Manchester, UK"
-        assert result["personal_statement"] == "Dedicated project manager with 5+ years experience."
-        assert result["skills"] == ["Project Management", "Agile", "Scrum", "Leadership"]
-        assert result["links"] == ["https://linkedin.com/in/alicejohnson"]
-    
-    def test_generator_to_parser_complex(self):
-        """Test conversion with experience and education data."""
-        generator_data = {
-            "data": {
-                "firstName": "Bob",
-                "surname": "Brown",
+                "links": ["https://linkedin.com/in/alicejohnson"],
+            },
+            id="generator_to_parser_basic"),
+        pytest.param(
+            "generator_to_parser", _GENERATOR_COMPLEX,
+            {
                 "experience": [
                     {
-                        "role": "Marketing Manager",
+                        "title": "Marketing Manager",
                         "company": "Brand Co",
-                        "startDate": "2019-05",
-                        "endDate": "",
-                        "current": True,
-                        "description": "Managing marketing campaigns."
-                    }
+                        "start_date": "2019-05",
+                        "end_date": "",
+                        "is_current": True,
+                        "description": "Managing marketing campaigns.",
+                    },
                 ],
                 "education": [
                     {
                         "institution": "Marketing School",
                         "degree": "Marketing",
-                        "startDate": "2015-09",
-                        "endDate": "2019-06",
-                        "grade": "Merit"
-                    }
+                        "start_date": "2015-09",
+                        "end_date": "2019-06",
+                        "grade": "Merit",
+                    },
                 ],
                 "certifications": [
                     {
                         "name": "Digital Marketing",
                         "issuer": "Marketing Institute",
-                        "date": "2020-01"
-                    }
-                ]
-            }
-        }
-        
-        result = HireableCVAdapter.generator_to_parser(generator_data)
-        
-        assert "experience" in result
-        assert len(result["experience"]) == 1
-        assert result["experience"][0]["title"] == "Marketing Manager"
-        assert result["experience"][0]["company"] == "Brand Co"
-        assert result["experience"][0]["is_current"] == True
-        
-        assert "education" in result
-        assert len(result["education"]) == 1
-        assert result["education"][0]["institution"] == "Marketing School"
-        assert result["education"][0]["degree"] == "Marketing"
-        
-        assert "certifications" in result
-        assert len(result["certifications"]) == 1
-        assert result["certifications"][0]["name"] == "Digital Marketing"
-        assert result["certifications"][0]["issuer"] == "Marketing Institute"
-    
+                        "date": "2020-01",
+                        "description": "",
+                    },
+                ],
+            },
+            id="generator_to_parser_complex"),
+    ])
+    def test_conversion(self, direction, payload, expected):
+        """Table-driven conversion checks for both adapter directions."""
+        # The adapter guards on isinstance(..., dict), so hand it a cheap
+        # shallow dict view of the read-only payload.
+        result = getattr(HireableCVAdapter, direction)(dict(payload))
+
+        for path, value in expected.items():
+            assert _dig(result, path) == value
+
+    @pytest.mark.parametrize("payload", [_PARSER_BASIC, _PARSER_COMPLEX],
+                             ids=["basic", "complex"])
+    def test_parser_round_trip(self, payload):
+        """Converting to generator format and back preserves every field."""
+        round_tripped = HireableCVAdapter.generator_to_parser(
+            HireableCVAdapter.parser_to_generator(dict(payload))
+        )
+        assert _strip_empty(round_tripped) == _strip_empty(dict(payload))
+
     def test_empty_data_handling(self):
         """Test handling of empty or None input data."""
         assert HireableCVAdapter.parser_to_generator(None) == {}
         assert HireableCVAdapter.parser_to_generator({}) == {}
         assert HireableCVAdapter.generator_to_parser(None) == {}
-        assert HireableCVAdapter.generator_to_parser({}) == {} 
\ No newline at end of file
+        assert HireableCVAdapter.generator_to_parser({}) == {}
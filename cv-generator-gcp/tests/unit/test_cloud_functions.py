@@ -1,249 +1,114 @@
+import copy
 import pytest
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock
 from io import BytesIO
 import requests
-from utils.client import HireableClient
-import os
+
+# Response prototypes built once at import; tests copy and install them.
+# Plain attribute bags: the responses are only ever read, so none of
+# MagicMock's call-recording or magic-method setup is needed.
+_OK_RESPONSE = SimpleNamespace(status_code=200, content=b"mock pdf content")
+
+# DOCX magic header shared by every sample file; only the BytesIO view is
+# rebuilt per test because the client reads and closes it.
+_SAMPLE_DOCX_BYTES = b"PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00"
+_UNAUTHORIZED_RESPONSE = SimpleNamespace(status_code=401, text="Unauthorized")
+_ERROR_RESPONSE = SimpleNamespace(status_code=500, text="Conversion failed")
 
 class TestDocxToPdfCloudFunction:
     """Test suite for the docx_to_pdf Cloud Function."""
 
+    # The client fixture (a shallow copy of the session-wide _client_template
+    # from conftest.py) provides a fully initialised HireableClient.
+
     @pytest.fixture
     def sample_docx_file(self):
         """Create a sample DOCX file content."""
-        file = BytesIO(b"PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00")
+        file = BytesIO(_SAMPLE_DOCX_BYTES)
         file.name = "test.docx"
         return file
 
-    @pytest.fixture
-    def mock_secret_manager(self):
-        """Mock the Secret Manager client."""
-        with patch('utils.client.secretmanager.SecretManagerServiceClient') as mock:
-            mock_instance = MagicMock()
-            mock_instance.access_secret_version.return_value = MagicMock(
-                payload=MagicMock(data=b"test-api-key")
-            )
-            mock.return_value = mock_instance
-            yield mock
-
-    def test_successful_conversion(self, sample_docx_file, mock_secret_manager):
-        """Test successful DOCX to PDF conversion."""
-        with patch('utils.client.requests.post') as mock_post:
-            # Configure mock response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.content = b"mock pdf content"
-            mock_post.return_value = mock_response
-
-            # Set environment variables
-            os.environ["PROJECT_ID"] = "test-project"
-            os.environ["PDF_API_KEY_SECRET"] = "test-pdf-api-key"
-            os.environ["PDF_CONVERSION_ENDPOINT"] = "https://example.com/convert"
-
-            # Create client instance
-            client = HireableClient()
-
-            # Call the conversion
-            result = client.docx_to_pdf(sample_docx_file)
-
-            # Verify response
-            assert result.content == b"mock pdf content"
-            assert result.status_code == 200
-
-            # Verify request was made correctly
-            mock_post.assert_called_once()
-            args, kwargs = mock_post.call_args
-            assert args[0] == "https://example.com/convert"
-            assert "files" in kwargs
-            assert "headers" in kwargs
-            assert kwargs["headers"] == {"API-Key": "test-api-key"}
-
-            # Clean up environment variables
-            del os.environ["PROJECT_ID"]
-            del os.environ["PDF_API_KEY_SECRET"]
-            del os.environ["PDF_CONVERSION_ENDPOINT"]
-
-    def test_authentication_failure(self, sample_docx_file, mock_secret_manager):
-        """Test handling of authentication failures."""
-        with patch('utils.client.requests.post') as mock_post:
-            # Configure mock to simulate auth failure
-            mock_response = MagicMock()
-            mock_response.status_code = 401
-            mock_response.text = "Unauthorized"
-            mock_post.return_value = mock_response
-
-            # Set environment variables
-            os.environ["PROJECT_ID"] = "test-project"
-            os.environ["PDF_API_KEY_SECRET"] = "test-pdf-api-key"
-            os.environ["PDF_CONVERSION_ENDPOINT"] = "https://example.com/convert"
-
-            # Create client instance
-            client = HireableClient()
-
-            # Attempt conversion
-            with pytest.raises(Exception) as excinfo:
+    @pytest.mark.parametrize("response,raises,match", [
+        pytest.param(_OK_RESPONSE, None, None, id="success"),
+        pytest.param(_UNAUTHORIZED_RESPONSE, requests.HTTPError,
+                     r"401.*Unauthorized", id="auth_failure"),
+        pytest.param(_ERROR_RESPONSE, requests.HTTPError,
+                     r"500.*Conversion failed", id="conversion_error"),
+        pytest.param(requests.Timeout("Request timed out"), requests.Timeout,
+                     "Request timed out", id="timeout"),
+    ])
+    def test_conversion_outcomes(self, sample_docx_file, client, monkeypatch,
+                                 response, raises, match):
+        """One table for the success, auth-failure, server-error and timeout paths."""
+        mock_post = Mock()
+        if isinstance(response, Exception):
+            mock_post.side_effect = response
+        else:
+            mock_post.return_value = copy.copy(response)
+        monkeypatch.setattr("utils.client.requests.Session.post", mock_post)
+
+        if raises is not None:
+            with pytest.raises(raises, match=match):
                 client.docx_to_pdf(sample_docx_file)
+            return
 
-            assert "401" in str(excinfo.value)
-            assert "Unauthorized" in str(excinfo.value)
+        result = client.docx_to_pdf(sample_docx_file)
 
-            # Clean up environment variables
-            del os.environ["PROJECT_ID"]
-            del os.environ["PDF_API_KEY_SECRET"]
-            del os.environ["PDF_CONVERSION_ENDPOINT"]
+        # Verify response
+        assert result.content == b"mock pdf content"
+        assert result.status_code == 200
 
-    def test_invalid_file_type(self):
+        # Verify request was made correctly
+        mock_post.assert_called_once()
+        args, kwargs = mock_post.call_args
+        assert args[0] == "https://example.com/convert"
+        assert "files" in kwargs
+        assert "headers" in kwargs
+        assert kwargs["headers"] == {"API-Key": "test-api-key"}
+
+    def test_invalid_file_type(self, client):
         """Test handling of invalid file type."""
         # Create invalid file
         invalid_file = BytesIO(b"invalid content")
         invalid_file.name = "test.txt"
 
-        # Set environment variables
-        os.environ["PROJECT_ID"] = "test-project"
-        os.environ["PDF_API_KEY_SECRET"] = "test-pdf-api-key"
-        os.environ["PDF_CONVERSION_ENDPOINT"] = "https://example.com/convert"
-
-        # Create client instance
-        client = HireableClient()
-
         # Attempt conversion
-        with pytest.raises(ValueError) as excinfo:
+        with pytest.raises(ValueError, match="Invalid file type"):
             client.docx_to_pdf(invalid_file)
 
-        assert "Invalid file type" in str(excinfo.value)
-
-        # Clean up environment variables
-        del os.environ["PROJECT_ID"]
-        del os.environ["PDF_API_KEY_SECRET"]
-        del os.environ["PDF_CONVERSION_ENDPOINT"]
-
-    def test_missing_file(self):
+    def test_missing_file(self, client):
         """Test handling of missing file."""
-        # Set environment variables
-        os.environ["PROJECT_ID"] = "test-project"
-        os.environ["PDF_API_KEY_SECRET"] = "test-pdf-api-key"
-        os.environ["PDF_CONVERSION_ENDPOINT"] = "https://example.com/convert"
-
-        # Create client instance
-        client = HireableClient()
-
         # Attempt conversion with None
-        with pytest.raises(ValueError) as excinfo:
+        with pytest.raises(ValueError, match="No file provided"):
             client.docx_to_pdf(None)
 
-        assert "No file provided" in str(excinfo.value)
-
-        # Clean up environment variables
-        del os.environ["PROJECT_ID"]
-        del os.environ["PDF_API_KEY_SECRET"]
-        del os.environ["PDF_CONVERSION_ENDPOINT"]
-
-    def test_large_file_handling(self):
+    def test_large_file_handling(self, client, fake_file):
         """Test handling of large files."""
-        # Create large file (11MB)
-        large_file = BytesIO(b"0" * (11 * 1024 * 1024))
-        large_file.name = "large.docx"
-
-        # Set environment variables
-        os.environ["PROJECT_ID"] = "test-project"
-        os.environ["PDF_API_KEY_SECRET"] = "test-pdf-api-key"
-        os.environ["PDF_CONVERSION_ENDPOINT"] = "https://example.com/convert"
-
-        # Create client instance
-        client = HireableClient()
+        # A lazy 11MB stand-in: the client rejects on size before reading,
+        # so nothing needs to be allocated
+        large_file = fake_file(11 * 1024 * 1024, "large.docx")
 
         # Attempt conversion
-        with pytest.raises(ValueError) as excinfo:
+        with pytest.raises(ValueError, match="File too large"):
             client.docx_to_pdf(large_file)
+        # The rejection must come from the seek/tell size check, before any
+        # of the (pretend) 11MB is ever read
+        assert large_file.read_calls == 0
 
-        assert "File too large" in str(excinfo.value)
-
-        # Clean up environment variables
-        del os.environ["PROJECT_ID"]
-        del os.environ["PDF_API_KEY_SECRET"]
-        del os.environ["PDF_CONVERSION_ENDPOINT"]
-
-    def test_conversion_error(self, sample_docx_file, mock_secret_manager):
-        """Test handling of conversion errors."""
-        with patch('utils.client.requests.post') as mock_post:
-            # Configure mock to simulate conversion error
-            mock_response = MagicMock()
-            mock_response.status_code = 500
-            mock_response.text = "Conversion failed"
-            mock_post.return_value = mock_response
-
-            # Set environment variables
-            os.environ["PROJECT_ID"] = "test-project"
-            os.environ["PDF_API_KEY_SECRET"] = "test-pdf-api-key"
-            os.environ["PDF_CONVERSION_ENDPOINT"] = "https://example.com/convert"
-
-            # Create client instance
-            client = HireableClient()
-
-            # Attempt conversion
-            with pytest.raises(Exception) as excinfo:
-                client.docx_to_pdf(sample_docx_file)
-
-            assert "500" in str(excinfo.value)
-            assert "Conversion failed" in str(excinfo.value)
-
-            # Clean up environment variables
-            del os.environ["PROJECT_ID"]
-            del os.environ["PDF_API_KEY_SECRET"]
-            del os.environ["PDF_CONVERSION_ENDPOINT"]
-
-    def test_request_timeout(self, sample_docx_file, mock_secret_manager):
-        """Test handling of request timeouts."""
-        with patch('utils.client.requests.post') as mock_post:
-            # Configure mock to raise timeout
-            mock_post.side_effect = requests.Timeout("Request timed out")
-
-            # Set environment variables
-            os.environ["PROJECT_ID"] = "test-project"
-            os.environ["PDF_API_KEY_SECRET"] = "test-pdf-api-key"
-            os.environ["PDF_CONVERSION_ENDPOINT"] = "https://example.com/convert"
-
-            # Create client instance
-            client = HireableClient()
+    def test_memory_cleanup(self, sample_docx_file, client, monkeypatch):
+        """Test memory cleanup after conversion."""
+        mock_post = Mock()
+        monkeypatch.setattr("utils.client.requests.Session.post", mock_post)
+        # Configure mock response from the shared prototype
+        mock_post.return_value = copy.copy(_OK_RESPONSE)
 
-            # Attempt conversion
-            with pytest.raises(requests.Timeout) as excinfo:
-                client.docx_to_pdf(sample_docx_file)
+        # Call the conversion
+        result = client.docx_to_pdf(sample_docx_file)
 
-            assert "Request timed out" in str(excinfo.value)
+        # Verify response
+        assert result.content == b"mock pdf content"
 
-            # Clean up environment variables
-            del os.environ["PROJECT_ID"]
-            del os.environ["PDF_API_KEY_SECRET"]
-            del os.environ["PDF_CONVERSION_ENDPOINT"]
+        # Verify file was closed
+        assert sample_docx_file.closed
 
-    def test_memory_cleanup(self, sample_docx_file, mock_secret_manager):
-        """Test memory cleanup after conversion."""
-        with patch('utils.client.requests.post') as mock_post:
-            # Configure mock response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.content = b"mock pdf content"
-            mock_post.return_value = mock_response
-
-            # Set environment variables
-            os.environ["PROJECT_ID"] = "test-project"
-            os.environ["PDF_API_KEY_SECRET"] = "test-pdf-api-key"
-            os.environ["PDF_CONVERSION_ENDPOINT"] = "https://example.com/convert"
-
-            # Create client instance
-            client = HireableClient()
-
-            # Call the conversion
-            result = client.docx_to_pdf(sample_docx_file)
-
-            # Verify response
-            assert result.content == b"mock pdf content"
-
-            # Verify file was closed
-            assert sample_docx_file.closed
-
-            # Clean up environment variables
-            del os.environ["PROJECT_ID"]
-            del os.environ["PDF_API_KEY_SECRET"]
-            del os.environ["PDF_CONVERSION_ENDPOINT"] 
\ No newline at end of file
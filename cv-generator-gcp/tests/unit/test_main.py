@@ -8,82 +8,75 @@ from models.schema import CVGenerationRequest
 
 class TestMainFunction:
     """Test suite for the main Cloud Function."""
-    
-    @patch('main.Validation')
-    @patch('main.HireableClient')
-    @patch('main.HireableUtils')
-    def test_generate_cv_success(self, mock_utils_class, mock_client_class, mock_validation_class, mock_request, mock_docx_template):
-        """Test successful CV generation."""
-        # Set up mocks
-        mock_validation = MagicMock()
-        mock_validation.validate_request.return_value = True
-        mock_validation._transform_request_keys.return_value = {
+
+    @pytest.fixture(autouse=True, scope="class")
+    def _patched_docx_template(self):
+        """Patch main.DocxTemplate once for the whole class.
+
+        Entering a patch context does a runtime attribute lookup every time;
+        the three generate_cv tests used identical template wiring, so one
+        class-wide patch (and one save closure) covers them all. Tests that
+        need different wiring install their own patch, which applies later
+        and wins.
+        """
+        with patch('main.DocxTemplate') as mock_docx:
+            mock_docx.return_value.save.side_effect = (
+                lambda output_stream: output_stream.write(b"mock template content")
+            )
+            yield mock_docx
+
+    @pytest.fixture
+    def patched_main(self, monkeypatch, main_validation, main_client, main_utils):
+        """Install all three collaborator mocks on main in one go.
+
+        One monkeypatch undo list replaces the three stacked @patch
+        decorators each test used to carry.
+        """
+        monkeypatch.setattr(main, "Validation", lambda: main_validation)
+        monkeypatch.setattr(main, "HireableClient", lambda: main_client)
+        monkeypatch.setattr(main, "HireableUtils", lambda: main_utils)
+
+    @pytest.mark.parametrize("extra_request,extra_transform,expect_pdf", [
+        pytest.param({}, {}, False, id="docx"),
+        pytest.param({"outputFormat": "pdf"}, {"output_format": "pdf"}, True,
+                     id="pdf_output"),
+        pytest.param({"isAnonymized": True}, {"is_anonymized": True}, False,
+                     id="anonymized"),
+    ])
+    def test_generate_cv(self, patched_main, mock_request, main_validation,
+                         main_client, extra_request, extra_transform, expect_pdf):
+        """CV generation across the docx, PDF and anonymized request variants."""
+        main_validation._transform_request_keys.return_value = {
             "data": {
                 "first_name": "John",
                 "surname": "Doe",
                 "experience": []
-            }
+            },
+            **extra_transform,
         }
-        mock_validation_class.return_value = mock_validation
-        
-        mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.content = b"mock pdf content"
-        mock_client.docx_to_pdf.return_value = mock_response
-        mock_client_class.return_value = mock_client
-        
-        mock_utils = MagicMock()
-        mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
-        # Return a proper template file and schema
-        mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-            json.dumps({"type": "object"}) if name == "cv_schema.json" 
-            else b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
-        )
-        mock_utils.generate_cv_download_link.return_value = "https://example.com/download-link"
-        mock_utils_class.return_value = mock_utils
-        
-        # Setup request mock with valid data
-        request_data = {
+        mock_request.get_json.return_value = {
             "data": {
                 "firstName": "John",
                 "surname": "Doe"
-            }
+            },
+            **extra_request,
         }
-        mock_request.get_json.return_value = request_data
-        
-        # Mock DocxTemplate and its methods
-        with patch('main.DocxTemplate') as mock_docx:
-            mock_template = MagicMock()
-            # Mock the save method to write some data to the BytesIO
-            def mock_save(output_stream):
-                output_stream.write(b"mock template content")
-                return None
-            mock_template.save.side_effect = mock_save
-            mock_docx.return_value = mock_template
-            
-            # Call the function
-            result = main.generate_cv(mock_request)
-            
-            # Check the result
-            assert result[1] == 200
-            response_data = json.loads(result[0])
-            assert "url" in response_data
-            assert response_data["url"] == "https://example.com/download-link"
-    
-    @patch('main.Validation')
-    @patch('main.HireableClient')
-    @patch('main.HireableUtils')
-    def test_generate_cv_validation_failure(self, mock_utils_class, mock_client_class, mock_validation_class, mock_invalid_request):
+
+        # Call the function
+        result = main.generate_cv(mock_request)
+
+        # Check the result
+        assert result[1] == 200
+        response_data = json.loads(result[0])
+        assert response_data["url"] == "https://example.com/download-link"
+
+        # PDF output goes through the conversion client; docx does not
+        assert main_client.docx_to_pdf.call_count == (1 if expect_pdf else 0)
+
+    def test_generate_cv_validation_failure(self, patched_main, mock_invalid_request, main_validation):
         """Test validation failure in CV generation."""
-        # Set up mocks
-        mock_validation = MagicMock()
-        mock_validation.validate_request.return_value = False
-        mock_validation_class.return_value = mock_validation
-        
-        mock_utils = MagicMock()
-        mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
-        mock_utils.retrieve_file_from_storage.return_value = json.dumps({"type": "object"})
-        mock_utils_class.return_value = mock_utils
+        # Same prototypes, with validation flipped to reject the request
+        main_validation.validate_request.return_value = False
         
         # Call the function
         result = main.generate_cv(mock_invalid_request)
@@ -93,126 +86,6 @@ class TestMainFunction:
         response_data = json.loads(result[0])
         assert "error" in response_data
     
-    @patch('main.Validation')
-    @patch('main.HireableClient')
-    @patch('main.HireableUtils')
-    def test_generate_cv_pdf_output(self, mock_utils_class, mock_client_class, mock_validation_class, mock_request, mock_docx_template):
-        """Test CV generation with PDF output."""
-        # Set up mocks
-        mock_validation = MagicMock()
-        mock_validation.validate_request.return_value = True
-        mock_validation._transform_request_keys.return_value = {
-            "data": {
-                "first_name": "John",
-                "surname": "Doe",
-                "experience": []
-            },
-            "output_format": "pdf"
-        }
-        mock_validation_class.return_value = mock_validation
-        
-        mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.content = b"mock pdf content"
-        mock_client.docx_to_pdf.return_value = mock_response
-        mock_client_class.return_value = mock_client
-        
-        mock_utils = MagicMock()
-        mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
-        # Return a proper binary string to simulate a template file for both schema and template
-        mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-            json.dumps({"type": "object"}) if name == "cv_schema.json" 
-            else b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
-        )
-        mock_utils.generate_cv_download_link.return_value = "https://example.com/download-link"
-        mock_utils_class.return_value = mock_utils
-        
-        # Setup request mock with PDF output format
-        request_data = {
-            "data": {
-                "firstName": "John",
-                "surname": "Doe"
-            },
-            "outputFormat": "pdf"
-        }
-        mock_request.get_json.return_value = request_data
-        
-        # Mock DocxTemplate and its methods
-        with patch('main.DocxTemplate') as mock_docx:
-            mock_template = MagicMock()
-            # Mock the save method to write some data to the BytesIO
-            def mock_save(output_stream):
-                output_stream.write(b"mock template content")
-                return None
-            mock_template.save.side_effect = mock_save
-            mock_docx.return_value = mock_template
-            
-            # Call the function
-            result = main.generate_cv(mock_request)
-            
-            # Check the result
-            assert result[1] == 200
-            
-            # Check that PDF conversion was called
-            mock_client.docx_to_pdf.assert_called_once()
-    
-    @patch('main.Validation')
-    @patch('main.HireableClient')
-    @patch('main.HireableUtils')
-    def test_generate_cv_anonymized(self, mock_utils_class, mock_client_class, mock_validation_class, mock_request, mock_docx_template):
-        """Test CV generation with anonymization."""
-        # Set up mocks
-        mock_validation = MagicMock()
-        mock_validation.validate_request.return_value = True
-        mock_validation._transform_request_keys.return_value = {
-            "data": {
-                "first_name": "John",
-                "surname": "Doe",
-                "experience": []
-            },
-            "is_anonymized": True
-        }
-        mock_validation_class.return_value = mock_validation
-        
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-        
-        mock_utils = MagicMock()
-        mock_utils.retrieve_profile_config.return_value = MagicMock(schema_file="cv_schema.json", template="template_WIP.docx")
-        # Return a proper template file and schema
-        mock_utils.retrieve_file_from_storage.side_effect = lambda bucket, name: (
-            json.dumps({"type": "object"}) if name == "cv_schema.json" 
-            else b'PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00'
-        )
-        mock_utils.generate_cv_download_link.return_value = "https://example.com/download-link"
-        mock_utils_class.return_value = mock_utils
-        
-        # Setup request mock with anonymization
-        request_data = {
-            "data": {
-                "firstName": "John",
-                "surname": "Doe"
-            },
-            "isAnonymized": True
-        }
-        mock_request.get_json.return_value = request_data
-        
-        # Mock DocxTemplate and its methods
-        with patch('main.DocxTemplate') as mock_docx:
-            mock_template = MagicMock()
-            # Mock the save method to write some data to the BytesIO
-            def mock_save(output_stream):
-                output_stream.write(b"mock template content")
-                return None
-            mock_template.save.side_effect = mock_save
-            mock_docx.return_value = mock_template
-            
-            # Call the function
-            result = main.generate_cv(mock_request)
-            
-            # Check the result
-            assert result[1] == 200
-    
     def test_escape_ampersands(self):
         """Test the escape_ampersands function."""
         # Test with a string
@@ -5,8 +5,50 @@ from unittest.mock import patch, MagicMock
 from utils.security import SecurityUtils
 from datetime import datetime, timedelta
 
+# Token variants signed once at import: HS256 signing is the dominant cost of
+# the validation tests, and the payloads are static for a whole run. Each case
+# maps to (token, expected ValueError match or None for success).
+_JWT_CLAIMS = {
+    "sub": "user-123",
+    "email": "user@example.com",
+    "aud": "authenticated",
+}
+# One "now" shared by every variant so all expirations are derived from the
+# same instant instead of re-reading the clock per token.
+_NOW = datetime.utcnow()
+_EXP_FUTURE = _NOW + timedelta(hours=1)
+_EXP_PAST = _NOW - timedelta(hours=1)
+_JWT_CASES = {
+    "valid": (
+        jwt.encode({**_JWT_CLAIMS, "exp": _EXP_FUTURE},
+                   "test-secret", algorithm="HS256"),
+        None,
+    ),
+    "expired": (
+        jwt.encode({**_JWT_CLAIMS, "exp": _EXP_PAST},
+                   "test-secret", algorithm="HS256"),
+        "Authentication token has expired",
+    ),
+    "invalid_signature": (
+        jwt.encode({**_JWT_CLAIMS, "exp": _EXP_FUTURE},
+                   "wrong-secret", algorithm="HS256"),
+        "Invalid authentication token",
+    ),
+    "missing_sub": (
+        jwt.encode({"email": _JWT_CLAIMS["email"], "aud": "authenticated",
+                    "exp": _EXP_FUTURE},
+                   "test-secret", algorithm="HS256"),
+        "Token missing 'sub' claim",
+    ),
+}
+
 class TestSecurityUtils:
     """Test suite for the SecurityUtils class."""
+
+    @pytest.fixture(autouse=True)
+    def _jwt_secret(self, monkeypatch):
+        """Serve the JWT secret from the environment for every test."""
+        monkeypatch.setenv("SUPABASE_JWT_SECRET", "test-secret")
     
     @patch("utils.security.secretmanager.SecretManagerServiceClient")
     def test_init(self, mock_client):
@@ -20,83 +62,40 @@ class TestSecurityUtils:
             security = SecurityUtils()
             assert security.project_id == "env-project"
     
-    @patch.dict(os.environ, {"SUPABASE_JWT_SECRET": "test-secret"})
-    def test_validate_supabase_jwt_valid(self):
-        """Test validation of a valid Supabase JWT token."""
-        security = SecurityUtils(project_id="test-project")
-        
-        # Create a valid token
-        payload = {
-            "sub": "user-123",
-            "email": "user@example.com",
-            "aud": "authenticated",
-            "exp": datetime.utcnow() + timedelta(hours=1)
-        }
-        token = jwt.encode(payload, "test-secret", algorithm="HS256")
-        
-        # Validate the token
-        decoded = security.validate_supabase_jwt(token)
-        
-        assert decoded["sub"] == "user-123"
-        assert decoded["email"] == "user@example.com"
-    
-    @patch.dict(os.environ, {"SUPABASE_JWT_SECRET": "test-secret"})
-    def test_validate_supabase_jwt_expired(self):
-        """Test validation of an expired JWT token."""
-        security = SecurityUtils(project_id="test-project")
-        
-        # Create an expired token
-        payload = {
-            "sub": "user-123",
-            "email": "user@example.com",
-            "aud": "authenticated",
-            "exp": datetime.utcnow() - timedelta(hours=1)
-        }
-        token = jwt.encode(payload, "test-secret", algorithm="HS256")
-        
-        # Validate the token
-        with pytest.raises(ValueError, match="Authentication token has expired"):
-            security.validate_supabase_jwt(token)
-    
-    @patch.dict(os.environ, {"SUPABASE_JWT_SECRET": "test-secret"})
-    def test_validate_supabase_jwt_invalid(self):
-        """Test validation of an invalid JWT token."""
-        security = SecurityUtils(project_id="test-project")
-        
-        # Create a token with wrong signature
-        payload = {
-            "sub": "user-123",
-            "email": "user@example.com",
-            "aud": "authenticated",
-            "exp": datetime.utcnow() + timedelta(hours=1)
-        }
-        token = jwt.encode(payload, "wrong-secret", algorithm="HS256")
-        
-        # Validate the token
-        with pytest.raises(ValueError, match="Invalid authentication token"):
-            security.validate_supabase_jwt(token)
-    
-    @patch.dict(os.environ, {"SUPABASE_JWT_SECRET": "test-secret"})
-    def test_validate_supabase_jwt_missing_sub(self):
-        """Test validation of a JWT token without sub claim."""
-        security = SecurityUtils(project_id="test-project")
+    @pytest.mark.parametrize("case", list(_JWT_CASES), ids=list(_JWT_CASES))
+    def test_validate_supabase_jwt(self, security_utils, case):
+        """Validation outcomes across the pre-signed token variants."""
+        token, error = _JWT_CASES[case]
+
+        if error is None:
+            decoded = security_utils.validate_supabase_jwt(token)
+            assert decoded["sub"] == "user-123"
+            assert decoded["email"] == "user@example.com"
+        else:
+            with pytest.raises(ValueError, match=error):
+                security_utils.validate_supabase_jwt(token)
+
+    def test_validate_supabase_jwt_cached(self, security_utils):
+        """Test that repeat validations of the same token hit the cache."""
+        security = security_utils
+
+        # Reuse the pre-signed valid token
+        token, _ = _JWT_CASES["valid"]
+
+        # First validation populates the cache
+        first = security.validate_supabase_jwt(token)
         
-        # Create a token without sub claim
-        payload = {
-            "email": "user@example.com",
-            "aud": "authenticated",
-            "exp": datetime.utcnow() + timedelta(hours=1)
-        }
-        token = jwt.encode(payload, "test-secret", algorithm="HS256")
+        # Second validation must not re-run the signature verification
+        with patch("utils.security.jwt.decode") as mock_decode:
+            second = security.validate_supabase_jwt(token)
         
-        # Validate the token
-        with pytest.raises(ValueError, match="Token missing 'sub' claim"):
-            security.validate_supabase_jwt(token)
+        mock_decode.assert_not_called()
+        assert second == first
     
-    def test_extract_token_from_header(self):
+    def test_extract_token_from_header(self, security_utils):
         """Test extracting a token from the Authorization header."""
-        security = SecurityUtils(project_id="test-project")
-        
+        security = security_utils
+
         # Valid token
         assert security.extract_token_from_header("Bearer token123") == "token123"
         
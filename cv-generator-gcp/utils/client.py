@@ -3,6 +3,8 @@ import logging
 import os
 import io
 import json
+import random
+import time
 from google.cloud import secretmanager
 from typing import Optional, Dict, Any, BinaryIO
 from google.cloud import storage
@@ -30,6 +32,13 @@ class HireableClient:
         
         # Initialize storage client
         self.storage_client = storage.Client()
+
+        # One shared session so repeated conversions reuse pooled keep-alive
+        # connections instead of paying TCP+TLS setup on every request
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         
         # Get API key from secret manager
         self.pdf_api_key = self._get_api_key()
@@ -101,7 +110,7 @@ class HireableClient:
                     elif file_name.lower().endswith('.rtf'):
                         content_type = "application/rtf"
                         
-                    response = requests.post(
+                    response = self._session.post(
                         self.pdf_conversion_endpoint,
                         files={"file": (file_name, file, content_type)},
                         headers=headers,
@@ -115,16 +124,43 @@ class HireableClient:
                     if response.text:
                         error_msg += f" - {response.text}"
                     self.logger.error(error_msg)
-                    raise Exception(error_msg)
+                    # HTTPError rather than bare Exception so callers can
+                    # distinguish a bad upstream response from retryable
+                    # transport failures
+                    http_error = requests.HTTPError(error_msg, response=response)
+
+                    # Only transient statuses are worth retrying; a 4xx
+                    # (bad request, auth failure) will not succeed on a
+                    # second attempt, so fail fast instead of burning
+                    # max_retries round trips
+                    if response.status_code == 429 or response.status_code >= 500:
+                        last_error = http_error
+                        retry_count += 1
+                        if retry_count < max_retries:
+                            self.logger.warning(
+                                f"Retry {retry_count}/{max_retries} after status {response.status_code}"
+                            )
+                            # The failed attempt consumed the stream; rewind
+                            # so the retry re-sends the full file
+                            file.seek(0)
+                            # Jittered backoff so concurrent clients do not
+                            # hammer a struggling converter in lockstep
+                            time.sleep(random.uniform(2, 4) * retry_count)
+                            continue
+                        break
+                    raise http_error
 
                 except (requests.Timeout, requests.ConnectionError) as e:
                     last_error = e
                     retry_count += 1
                     if retry_count < max_retries:
                         self.logger.warning(f"Retry {retry_count}/{max_retries} after error: {str(e)}")
-                        # Reopen the file for retry if it was closed
-                        if file.closed:
-                            file.seek(0)
+                        # The failed attempt consumed the stream; rewind so
+                        # the retry re-sends the full file
+                        file.seek(0)
+                        # Jittered backoff so concurrent clients do not
+                        # hammer a struggling converter in lockstep
+                        time.sleep(random.uniform(2, 4) * retry_count)
                         continue
                     break
                 except Exception as e:
@@ -170,7 +206,7 @@ class HireableClient:
                 if task:
                     data["task"] = task
                     
-                response = requests.post(
+                response = self._session.post(
                     self.parser_api_endpoint,
                     files=files,
                     data=data,
@@ -189,7 +225,7 @@ class HireableClient:
                 if task:
                     payload["task"] = task
                     
-                response = requests.post(
+                response = self._session.post(
                     self.parser_api_endpoint,
                     json=payload,
                     headers=headers,
@@ -1,6 +1,8 @@
 import jwt
+import hashlib
 import os
 import logging
+import time
 from google.cloud import secretmanager
 from typing import Dict, Any, Optional
 
@@ -9,6 +11,10 @@ class SecurityUtils:
     Security utility class for handling authentication and authorization.
     """
     
+    # Upper bound on cached token validations; entries are small
+    # (16-byte digest -> decoded payload) so this stays a few hundred KB.
+    _TOKEN_CACHE_MAX = 4096
+
     def __init__(self, project_id=None):
         """
         Initialize the security utils with the project ID.
@@ -18,6 +24,7 @@ class SecurityUtils:
         """
         self.project_id = project_id or os.environ.get("PROJECT_ID")
         self.secret_client = secretmanager.SecretManagerServiceClient()
+        self._token_cache: Dict[bytes, Any] = {}
     
     def validate_supabase_jwt(self, token: str) -> Dict[str, Any]:
         """
@@ -32,6 +39,19 @@ class SecurityUtils:
         Raises:
             ValueError: If the token is invalid or expired.
         """
+        # The same bearer token is typically presented for its whole
+        # lifetime, so reuse a previous successful validation instead of
+        # re-running the HMAC verification per request. The key is a digest
+        # rather than the raw token so tokens are not kept alive in memory.
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = self._token_cache.get(cache_key)
+        if cached is not None:
+            decoded_token, exp = cached
+            if exp is None or time.time() < exp:
+                return decoded_token
+            # Expired entry: evict and fall through to full verification
+            del self._token_cache[cache_key]
+
         try:
             # Get JWT secret from environment or Secret Manager
             jwt_secret = os.environ.get("SUPABASE_JWT_SECRET")
@@ -50,6 +70,12 @@ class SecurityUtils:
             if not decoded_token.get("sub"):
                 raise ValueError("Token missing 'sub' claim")
                 
+            # Only cache tokens that passed verification; invalid tokens
+            # always take the full decode path above
+            if len(self._token_cache) >= self._TOKEN_CACHE_MAX:
+                self._token_cache.clear()
+            self._token_cache[cache_key] = (decoded_token, decoded_token.get("exp"))
+
             return decoded_token
         except jwt.ExpiredSignatureError:
             logging.error("Token has expired")